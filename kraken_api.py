@@ -1,19 +1,82 @@
-import krakenex
+import asyncio
 import time
-import base64
-import hashlib
-import hmac
-import urllib.parse
-from typing import Optional, Tuple, Dict, Any
+import json
+import logging
+import threading
+import numpy as np
+from concurrent.futures import Future
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Tuple, Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Standard pair format -> Kraken pair name
+_PAIR_MAP = MappingProxyType({
+    'BTC/USD': 'XXBTZUSD',
+    'ETH/USD': 'XETHZUSD',
+    'SOL/USD': 'SOLUSD',
+    'ADA/USD': 'ADAUSD',
+    'DOT/USD': 'DOTUSD',
+    'XRP/USD': 'XRPUSD',
+})
+
+# USD pricing pair for each major asset, and balances already held in USD
+_USD_PAIRS = MappingProxyType({
+    'XBT': 'XXBTZUSD',
+    'ETH': 'XETHZUSD',
+    'SOL': 'SOLUSD',
+    'ADA': 'ADAUSD',
+    'DOT': 'DOTUSD',
+    'XRP': 'XRPUSD',
+})
+_USD_ASSETS = frozenset({'ZUSD', 'USD'})
+
+_WS_PUBLIC_URL = 'wss://ws.kraken.com'
+_WS_PRIVATE_URL = 'wss://ws-auth.kraken.com'
+_ORDER_DONE_STATUSES = frozenset({'closed', 'canceled', 'expired'})
+
+# Seconds to wait for a Ticker response; a rerun reading a price never stalls longer
+_TICKER_TIMEOUT = 2.0
+
+@lru_cache(maxsize=256)
+def _strip_pair_slash(pair: str) -> str:
+    """Fallback conversion for pairs missing from _PAIR_MAP"""
+    return pair.replace('/', '')
 
 class KrakenAPI:
-    def __init__(self, api_key: str = '', api_secret: str = '', sandbox: bool = True):
+    __slots__ = (
+        'api_key', 'api_secret', 'sandbox', 'api',
+        '_ticker_cache', '_ticker_ttl', '_stream_ttl',
+        '_streamed_pairs', 'order_state', '_order_stream_live', '_streams',
+        '_inflight', '_inflight_lock',
+    )
+    
+    def __init__(self, api_key: str = '', api_secret: str = '', sandbox: bool = True, tier: int = 2):
         self.api_key = api_key
         self.api_secret = api_secret
         self.sandbox = sandbox
         
-        # Initialize krakenex client
-        self.api = krakenex.API(key=api_key, secret=api_secret)
+        # Last trade prices keyed by Kraken pair: pair -> (monotonic ts, price)
+        self._ticker_cache: Dict[str, Tuple[float, float]] = {}
+        self._ticker_ttl = 5.0  # seconds; tickers move in real time
+        self._stream_ttl = 30.0  # streamed prices older than this are treated as stale
+        
+        # WebSocket state: pairs kept fresh by a live ticker stream, and open
+        # orders (txid -> order info) pushed by the private openOrders feed
+        self._streamed_pairs = set()
+        self.order_state: Dict[str, Dict[str, Any]] = {}
+        self._order_stream_live = False
+        self._streams = []
+        
+        # Ticker requests in flight, keyed by pair, so concurrent callers share them
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Initialize krakenex client; imported here so the HTTP/krakenex
+        # stack only loads once a client is actually built
+        from kraken_client import KrakenClient
+        self.api = KrakenClient(key=api_key, secret=api_secret, tier=tier)
     
     def test_connection(self, api_key: str = None, api_secret: str = None, sandbox: bool = None) -> Tuple[bool, str]:
         """Test connection to Kraken API"""
@@ -26,11 +89,15 @@ class KrakenAPI:
             if not key or not secret:
                 return False, "API key or secret missing"
             
-            # Create temporary API instance for testing
-            test_api = krakenex.API(key=key, secret=secret)
-            
-            # Test with balance query
-            response = test_api.query_private('Balance')
+            # Test with balance query. Other credentials get a throwaway client:
+            # it still shares the pooled session and nonce, but never signs
+            # calls made on the shared one or spends its rate-limit budget
+            if key == self.api.key and secret == self.api.secret:
+                client = self.api
+            else:
+                from kraken_client import KrakenClient
+                client = KrakenClient(key=key, secret=secret)
+            response = client.query_private('Balance')
             
             if response.get('error'):
                 return False, f"API Error: {response['error']}"
@@ -42,26 +109,72 @@ class KrakenAPI:
     
     def get_ticker(self, pair: str) -> Optional[float]:
         """Get current ticker price for a pair"""
+        # Convert pair format (BTC/USD -> XXBTZUSD)
+        kraken_pair = self._convert_pair_to_kraken(pair)
+        return self.get_tickers([kraken_pair]).get(kraken_pair)
+    
+    def get_tickers(self, pairs: List[str]) -> Dict[str, float]:
+        """Get last trade prices for several Kraken pairs in one request
+        
+        Pairs already being fetched by another thread are not requested
+        again; their prices are taken from that request when it finishes.
+        """
+        with self._inflight_lock:
+            pending = {pair: self._inflight[pair] for pair in pairs if pair in self._inflight}
+            mine = [pair for pair in pairs if pair not in pending]
+            future = Future()
+            for pair in mine:
+                self._inflight[pair] = future
+        
+        prices = {}
+        if mine:
+            fetched = {}
+            try:
+                fetched = self._fetch_tickers(mine)
+            finally:
+                future.set_result(fetched)
+                with self._inflight_lock:
+                    for pair in mine:
+                        if self._inflight.get(pair) is future:
+                            del self._inflight[pair]
+            prices.update(fetched)
+        
+        for pair, other in pending.items():
+            price = other.result().get(pair)
+            if price is not None:
+                prices[pair] = price
+        return prices
+    
+    def _fetch_tickers(self, pairs: List[str]) -> Dict[str, float]:
+        """Issue one Ticker request for pairs"""
         try:
-            # Convert pair format (BTC/USD -> XXBTZUSD)
-            kraken_pair = self._convert_pair_to_kraken(pair)
-            
-            response = self.api.query_public('Ticker', {'pair': kraken_pair})
-            
-            if response.get('error'):
-                print(f"Ticker error: {response['error']}")
-                return None
-            
-            result = response.get('result', {})
-            if kraken_pair in result:
-                price_str = result[kraken_pair]['c'][0]  # Last trade closed
-                return float(price_str)
-            
-            return None
-            
+            response = self.api.query_public('Ticker', {'pair': ','.join(pairs)}, timeout=_TICKER_TIMEOUT)
+            return self._parse_tickers(pairs, response)
         except Exception as e:
-            print(f"Error getting ticker: {e}")
-            return None
+            logger.error("Error getting tickers: %s", e, exc_info=True)
+            return {}
+    
+    def _parse_tickers(self, pairs: List[str], response: Dict[str, Any]) -> Dict[str, float]:
+        """Extract last trade prices from a Ticker response and cache them"""
+        if response.get('error'):
+            logger.error("Ticker error: %s", response['error'])
+            return {}
+        
+        result = response.get('result', {})
+        if len(pairs) == 1 and len(result) == 1 and pairs[0] not in result:
+            # Kraken may answer under its normalized name (e.g. XXBTZUSD)
+            result = {pairs[0]: next(iter(result.values()))}
+        
+        # Single pass: pull the last trade price and cache it alongside
+        now = time.monotonic()
+        cache = self._ticker_cache
+        prices = {}
+        for pair in pairs:
+            ticker = result.get(pair)
+            if ticker:
+                prices[pair] = price = float(ticker['c'][0])
+                cache[pair] = (now, price)
+        return prices
     
     def get_balance(self) -> Tuple[bool, float]:
         """Get account balance and calculate total USD value"""
@@ -72,87 +185,159 @@ class KrakenAPI:
             response = self.api.query_private('Balance')
             
             if response.get('error'):
-                print(f"Balance error: {response['error']}")
+                logger.error("Balance error: %s", response['error'])
                 return False, 0.0
             
-            balances = response.get('result', {})
-            
-            # Calculate total USD value (simplified)
-            total_usd = 0.0
+            holdings = self._holdings(response.get('result', {}))
             
-            # Get current prices for major assets
-            usd_pairs = {
-                'XBT': 'XXBTZUSD',
-                'ETH': 'XETHZUSD',
-                'SOL': 'SOLUSD',
-                'ADA': 'ADAUSD',
-                'DOT': 'DOTUSD',
-                'XRP': 'XRPUSD'
-            }
+            # One batched Ticker request for every held asset
+            needed = [_USD_PAIRS[a] for a, _ in holdings if a in _USD_PAIRS]
+            price_map = self.get_tickers_from_cache(needed) if needed else {}
             
-            for asset, amount_str in balances.items():
-                amount = float(amount_str)
-                if amount <= 0.000001:  # Skip tiny amounts
-                    continue
-                
-                if asset == 'ZUSD':  # USD
-                    total_usd += amount
-                elif asset in usd_pairs:
-                    # Get current price
-                    price = self.get_ticker_from_cache(usd_pairs[asset])
-                    if price:
-                        total_usd += amount * price
-            
-            return True, total_usd
+            return True, self._value_balances(holdings, price_map)
             
         except Exception as e:
-            print(f"Error getting balance: {e}")
+            logger.error("Error getting balance: %s", e, exc_info=True)
             return False, 0.0
     
+    @staticmethod
+    def _holdings(balances: Dict[str, str]) -> List[Tuple[str, float]]:
+        """Parse balances once, dropping tiny amounts"""
+        return [(asset, amount) for asset, amount_str in balances.items()
+                if (amount := float(amount_str)) > 0.000001]
+    
+    @staticmethod
+    def _value_balances(holdings: List[Tuple[str, float]], price_map: Dict[str, float]) -> float:
+        """Calculate total USD value of holdings (simplified)"""
+        count = len(holdings)
+        amounts = np.fromiter((amount for _, amount in holdings), dtype=np.float64, count=count)
+        prices = np.fromiter(
+            (1.0 if asset in _USD_ASSETS else price_map.get(_USD_PAIRS.get(asset), 0.0)
+             for asset, _ in holdings),
+            dtype=np.float64, count=count
+        )
+        return float(amounts @ prices)
+    
     def place_order(self, pair: str, side: str, order_type: str, volume: float) -> Tuple[bool, str]:
         """Place an order on Kraken"""
         try:
             if not self.api_key:
                 return False, "API key not configured"
             
-            kraken_pair = self._convert_pair_to_kraken(pair)
-            
-            order_data = {
-                'pair': kraken_pair,
-                'type': side,
-                'ordertype': order_type,
-                'volume': str(volume),
-            }
-            
-            response = self.api.query_private('AddOrder', order_data)
+            # A single order always goes through plain AddOrder, never the batch endpoint
+            order = {'side': side, 'order_type': order_type, 'volume': volume}
+            response = self.api.query_private(
+                'AddOrder', {'pair': self._convert_pair_to_kraken(pair), **self._order_fields(order)}
+            )
             
             if response.get('error'):
                 error_msg = response['error']
                 return False, f"Order failed: {error_msg}"
             
-            result = response.get('result', {})
-            txid = result.get('txid', [])
+            txids = response.get('result', {}).get('txid', [])
             
-            if txid:
-                return True, f"Order placed successfully (TXID: {txid[0]})"
+            if txids:
+                return True, f"Order placed successfully (TXID: {txids[0]})"
             else:
                 return True, "Order placed successfully"
             
         except Exception as e:
             return False, f"Order placement error: {str(e)}"
     
+    def place_orders_batch(self, pair: str, orders: List[Dict[str, Any]]) -> Tuple[bool, List[str]]:
+        """Place several orders on one pair, up to 15 per AddOrderBatch request
+        
+        Each order is a dict with 'side', 'order_type', 'volume' and an
+        optional 'price'. Returns whether every order was accepted and the
+        TXIDs of the ones that were.
+        """
+        try:
+            if not self.api_key:
+                logger.error("Batch order error: API key not configured")
+                return False, []
+            
+            txids, errors = self._submit_orders(self._convert_pair_to_kraken(pair), orders)
+            
+            if errors:
+                logger.error("Batch order error: %s", errors)
+            
+            return not errors, txids
+            
+        except Exception as e:
+            logger.error("Batch order placement error: %s", e, exc_info=True)
+            return False, []
+    
+    def _submit_orders(self, kraken_pair: str, orders: List[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+        """Send orders in chunks of 15 and collect (txids, errors)"""
+        txids = []
+        errors = []
+        
+        for start in range(0, len(orders), 15):
+            chunk = orders[start:start + 15]
+            
+            # AddOrderBatch needs at least two orders
+            if len(chunk) == 1:
+                response = self.api.query_private(
+                    'AddOrder', {'pair': kraken_pair, **self._order_fields(chunk[0])}
+                )
+            else:
+                # Kraken documents the batch as a JSON orders array
+                response = self.api.query_private_json('AddOrderBatch', {
+                    'pair': kraken_pair,
+                    'orders': [self._order_fields(order) for order in chunk]
+                })
+            
+            if response.get('error'):
+                errors.append(response['error'])
+                continue
+            
+            result = response.get('result', {})
+            for placed in result.get('orders', [result]):
+                if placed.get('error'):
+                    errors.append(placed['error'])
+                txid = placed.get('txid', [])
+                txids.extend(txid if isinstance(txid, list) else [txid])
+        
+        return txids, errors
+    
+    @staticmethod
+    def _order_fields(order: Dict[str, Any]) -> Dict[str, str]:
+        """Map an order dict to Kraken's AddOrder field names"""
+        fields = {
+            'type': order['side'],
+            'ordertype': order['order_type'],
+            'volume': str(order['volume']),
+        }
+        if order.get('price') is not None:
+            fields['price'] = str(order['price'])
+        return fields
+    
     def get_open_orders(self) -> Dict[str, Any]:
         """Get all open orders"""
+        if self._order_stream_live:
+            return {'error': [], 'result': {'open': dict(self.order_state)}}
+        
         try:
             response = self.api.query_private('OpenOrders')
             return response
         except Exception as e:
-            print(f"Error getting open orders: {e}")
+            logger.error("Error getting open orders: %s", e, exc_info=True)
             return {}
     
+    def get_open_order_ids(self) -> List[str]:
+        """Get open order TXIDs"""
+        response = self.get_open_orders()
+        
+        if response.get('error'):
+            logger.error("Open orders error: %s", response['error'])
+            return []
+        
+        return list(response.get('result', {}).get('open', {}))
+    
     def cancel_order(self, txid: str) -> Tuple[bool, str]:
         """Cancel an order"""
         try:
+            # A single cancel always goes through plain CancelOrder, never the batch endpoint
             response = self.api.query_private('CancelOrder', {'txid': txid})
             
             if response.get('error'):
@@ -163,19 +348,253 @@ class KrakenAPI:
         except Exception as e:
             return False, f"Cancel error: {str(e)}"
     
-    def _convert_pair_to_kraken(self, pair: str) -> str:
+    def cancel_orders(self, txids: List[str]) -> Tuple[bool, int]:
+        """Cancel several orders, up to 50 per CancelOrderBatch request"""
+        try:
+            count, errors = self._cancel_orders(txids)
+            
+            if errors:
+                logger.error("Batch cancel error: %s", errors)
+            
+            return not errors, count
+            
+        except Exception as e:
+            logger.error("Batch cancel error: %s", e, exc_info=True)
+            return False, 0
+    
+    def cancel_all(self) -> Tuple[bool, int]:
+        """Cancel every open order"""
+        try:
+            response = self.api.query_private('CancelAll')
+            
+            if response.get('error'):
+                logger.error("Cancel all error: %s", response['error'])
+                return False, 0
+            
+            return True, int(response.get('result', {}).get('count', 0))
+            
+        except Exception as e:
+            logger.error("Cancel all error: %s", e, exc_info=True)
+            return False, 0
+    
+    def _cancel_orders(self, txids: List[str]) -> Tuple[int, List[Any]]:
+        """Cancel orders in chunks of 50 and collect (count, errors)"""
+        count = 0
+        errors = []
+        
+        for start in range(0, len(txids), 50):
+            chunk = txids[start:start + 50]
+            
+            if len(chunk) == 1:
+                response = self.api.query_private('CancelOrder', {'txid': chunk[0]})
+            else:
+                # Kraken documents the batch as a JSON array of txids
+                response = self.api.query_private_json('CancelOrderBatch', {'orders': chunk})
+            
+            if response.get('error'):
+                errors.append(response['error'])
+                continue
+            
+            count += int(response.get('result', {}).get('count', 0))
+        
+        return count, errors
+    
+    @staticmethod
+    def _convert_pair_to_kraken(pair: str) -> str:
         """Convert standard pair format to Kraken format"""
-        pair_map = {
-            'BTC/USD': 'XXBTZUSD',
-            'ETH/USD': 'XETHZUSD',
-            'SOL/USD': 'SOLUSD',
-            'ADA/USD': 'ADAUSD',
-            'DOT/USD': 'DOTUSD',
-            'XRP/USD': 'XRPUSD',
-        }
-        return pair_map.get(pair, pair.replace('/', ''))
+        return _PAIR_MAP.get(pair) or _strip_pair_slash(pair)
     
     def get_ticker_from_cache(self, pair: str) -> Optional[float]:
-        """Get ticker price with caching"""
-        # Simple implementation - in production, you'd want proper caching
-        return self.get_ticker(pair)
\ No newline at end of file
+        """Get ticker price, reusing a cached value younger than the TTL"""
+        kraken_pair = self._convert_pair_to_kraken(pair)
+        price = self._cached_price(kraken_pair, time.monotonic())
+        if price is not None:
+            return price
+        return self.get_tickers([kraken_pair]).get(kraken_pair)
+    
+    def get_tickers_from_cache(self, pairs: List[str]) -> Dict[str, float]:
+        """Get ticker prices for several pairs, fetching only stale ones"""
+        now = time.monotonic()
+        prices = {}
+        stale = []
+        for pair in pairs:
+            price = self._cached_price(pair, now)
+            if price is not None:
+                prices[pair] = price
+            else:
+                stale.append(pair)
+        if stale:
+            prices.update(self.get_tickers(stale))
+        return prices
+    
+    def _cached_price(self, kraken_pair: str, now: float) -> Optional[float]:
+        """Cached price if younger than the TTL (longer for streamed pairs), else None"""
+        cached = self._ticker_cache.get(kraken_pair)
+        if cached:
+            ttl = self._stream_ttl if kraken_pair in self._streamed_pairs else self._ticker_ttl
+            if now - cached[0] < ttl:
+                return cached[1]
+        return None
+    
+    def start_ticker_stream(self, pairs: List[str]):
+        """Keep ticker prices for pairs current from Kraken's WebSocket feed"""
+        # WebSocket pair names use XBT, e.g. BTC/USD -> XBT/USD
+        ws_pairs = {pair.replace('BTC', 'XBT'): self._convert_pair_to_kraken(pair) for pair in pairs}
+        subscription = {
+            'event': 'subscribe',
+            'pair': list(ws_pairs),
+            'subscription': {'name': 'ticker'}
+        }
+        
+        def handle(msg):
+            # [channelID, {'c': [price, volume], ...}, 'ticker', 'XBT/USD']
+            if isinstance(msg, list) and msg[-2] == 'ticker' and msg[-1] in ws_pairs:
+                kraken_pair = ws_pairs[msg[-1]]
+                self._ticker_cache[kraken_pair] = (time.monotonic(), float(msg[1]['c'][0]))
+                self._streamed_pairs.add(kraken_pair)
+        
+        def reset():
+            self._streamed_pairs.difference_update(ws_pairs.values())
+        
+        self._start_stream(_WS_PUBLIC_URL, lambda: subscription, handle, reset)
+    
+    def _ws_token(self) -> Optional[str]:
+        """Fetch a token for the private WebSocket feed, or None on failure"""
+        try:
+            response = self.api.query_private('GetWebSocketsToken')
+            if response.get('error'):
+                logger.error("WebSocket token error: %s", response['error'])
+                return None
+            return response['result']['token']
+        except Exception as e:
+            logger.error("Error getting WebSocket token: %s", e, exc_info=True)
+            return None
+    
+    def start_order_stream(self) -> bool:
+        """Track open orders from Kraken's private openOrders feed"""
+        token = self._ws_token()
+        if token is None:
+            return False
+        # The first connect uses this token; tokens expire 15 minutes after
+        # issue, so every reconnect subscribes with a fresh one
+        tokens = [token]
+        
+        def subscribe():
+            token = tokens.pop() if tokens else self._ws_token()
+            if token is None:
+                return None
+            return {
+                'event': 'subscribe',
+                'subscription': {'name': 'openOrders', 'token': token}
+            }
+        
+        def handle(msg):
+            if isinstance(msg, dict):
+                # A rejected subscription leaves order_state unmaintained
+                if msg.get('event') == 'subscriptionStatus' and msg.get('status') == 'error':
+                    logger.error("openOrders subscription error: %s", msg.get('errorMessage'))
+                    self._order_stream_live = False
+                return
+            # [[{txid: {...}}, ...], 'openOrders', {'sequence': n}]
+            if not (isinstance(msg, list) and msg[1] == 'openOrders'):
+                return
+            if msg[2].get('sequence') == 1:  # initial snapshot
+                self.order_state.clear()
+            for update in msg[0]:
+                for txid, info in update.items():
+                    if info.get('status') in _ORDER_DONE_STATUSES:
+                        self.order_state.pop(txid, None)
+                    else:
+                        self.order_state.setdefault(txid, {}).update(info)
+            self._order_stream_live = True
+        
+        def reset():
+            self._order_stream_live = False
+        
+        self._start_stream(_WS_PRIVATE_URL, subscribe, handle, reset)
+        return True
+    
+    def _start_stream(self, url: str, subscribe, handle, reset):
+        """Run a WebSocket subscription on a daemon thread
+        
+        subscribe() builds the subscription message on every (re)connect.
+        reset() marks the stream's data stale; it runs on errors as well as
+        on close, since a drop that starts a reconnect only reports on_error.
+        """
+        import websocket
+        from kraken_client import json_loads
+        
+        def on_open(ws):
+            reset()
+            subscription = subscribe()
+            if subscription is not None:
+                ws.send(json.dumps(subscription))
+        
+        def on_message(ws, raw):
+            try:
+                handle(json_loads(raw))
+            except Exception as e:
+                logger.error("WebSocket message error: %s", e, exc_info=True)
+        
+        def on_error(ws, error):
+            logger.warning("WebSocket %s error: %s", url, error)
+            reset()
+        
+        app = websocket.WebSocketApp(
+            url,
+            on_open=on_open,
+            on_message=on_message,
+            on_error=on_error,
+            on_close=lambda ws, code, reason: reset()
+        )
+        self._streams.append(app)
+        threading.Thread(
+            target=app.run_forever, kwargs={'ping_interval': 30, 'reconnect': 5}, daemon=True
+        ).start()
+    
+    def close(self):
+        """Stop WebSocket streams; the pooled HTTP session is shared and stays open"""
+        for app in self._streams:
+            app.close()
+        self._streams.clear()
+        self.api.close()
+    
+    # Async variants: krakenex calls run in worker threads so independent
+    # requests overlap instead of blocking one after another
+    async def _query_private_async(self, method: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run a private query without blocking the event loop"""
+        return await asyncio.to_thread(self.api.query_private, method, data)
+    
+    async def get_tickers_async(self, pairs: List[str]) -> Dict[str, float]:
+        """Async variant of get_tickers"""
+        return await asyncio.to_thread(self.get_tickers, pairs)
+    
+    async def get_ticker_async(self, pair: str) -> Optional[float]:
+        """Async variant of get_ticker"""
+        kraken_pair = self._convert_pair_to_kraken(pair)
+        prices = await self.get_tickers_async([kraken_pair])
+        return prices.get(kraken_pair)
+    
+    async def get_balance_async(self) -> Tuple[bool, float]:
+        """Async variant of get_balance that doesn't block the event loop"""
+        try:
+            if not self.api_key:
+                return False, 0.0
+            
+            response = await self._query_private_async('Balance')
+            
+            if response.get('error'):
+                logger.error("Balance error: %s", response['error'])
+                return False, 0.0
+            
+            holdings = self._holdings(response.get('result', {}))
+            
+            # Price only the held assets, reusing cached/streamed prices
+            needed = [_USD_PAIRS[a] for a, _ in holdings if a in _USD_PAIRS]
+            price_map = await asyncio.to_thread(self.get_tickers_from_cache, needed) if needed else {}
+            
+            return True, self._value_balances(holdings, price_map)
+            
+        except Exception as e:
+            logger.error("Error getting balance: %s", e, exc_info=True)
+            return False, 0.0
@@ -0,0 +1,217 @@
+import krakenex
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+from functools import wraps
+from types import MappingProxyType
+from typing import Dict, Any, Union
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # optional speedup
+    json_loads = json.loads
+
+logger = logging.getLogger('kraken_api.client')
+
+# Private API counter per verification tier: (max counter, decay per second)
+_TIER_LIMITS = MappingProxyType({
+    2: (15, 0.33),  # Starter
+    3: (20, 0.5),   # Intermediate
+    4: (20, 1.0),   # Pro
+})
+
+# Counter cost of private endpoints that don't cost 1. Order placement and
+# cancellation are governed by the separate trading limit.
+_ENDPOINT_COSTS = MappingProxyType({
+    'Ledgers': 2,
+    'QueryLedgers': 2,
+    'TradesHistory': 2,
+    'QueryTrades': 2,
+    'AddOrder': 0,
+    'AddOrderBatch': 0,
+    'CancelOrder': 0,
+    'CancelOrderBatch': 0,
+    'CancelAll': 0,
+})
+
+# Kraken error prefixes that mean the request was rejected for rate limiting
+_RATE_LIMIT_ERRORS = ('EAPI:Rate limit exceeded', 'EGeneral:Too many requests')
+_CIRCUIT_OPEN_SECONDS = 15 * 60  # Kraken's lockout lasts about 15 minutes
+
+def _build_session() -> requests.Session:
+    """HTTP session shared by every client so TCP/TLS connections are reused"""
+    session = requests.Session()
+    # Retries are left to the caller; a failed request never silently repeats
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0)
+    session.mount('https://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+_SESSION = _build_session()
+
+def _is_rate_limited(response: Dict[str, Any]) -> bool:
+    """Whether a decoded Kraken response was rejected by the rate limiter"""
+    return any(str(err).startswith(_RATE_LIMIT_ERRORS) for err in response.get('error', []))
+
+def _with_retry(breaker: str, max_tries: int = 5, base: float = 0.25, cap: float = 8.0):
+    """Retry rate-limited queries with jittered exponential backoff
+    
+    Only rate-limit rejections (error codes or HTTP 429) are retried, since
+    those requests were never executed. When every attempt is rejected the
+    circuit breaker named by `breaker` opens and further queries behind it
+    fail fast until Kraken's lockout has passed. Public and private calls
+    have separate breakers because Kraken limits them separately.
+    """
+    def decorator(query):
+        @wraps(query)
+        def wrapper(self, method, *args, **kwargs):
+            if time.monotonic() < getattr(self, breaker):
+                raise RuntimeError(f"Rate limit circuit breaker open; {method} not sent")
+            
+            for attempt in range(max_tries):
+                if attempt:
+                    time.sleep(min(cap, base * 2 ** (attempt - 1)) + random.random() * 0.1)
+                try:
+                    response = query(self, method, *args, **kwargs)
+                    if not _is_rate_limited(response):
+                        return response
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code != 429:
+                        raise
+            
+            setattr(self, breaker, time.monotonic() + _CIRCUIT_OPEN_SECONDS)
+            logger.error("Kraken rate limit hit %d times on %s; pausing requests", max_tries, method)
+            raise RuntimeError(f"Rate limited by Kraken on {method}")
+        return wrapper
+    return decorator
+
+class KrakenClient(krakenex.API):
+    """krakenex client with a pooled session and a once-decoded API secret"""
+    
+    # Shared by every client so concurrent requests on one key never reuse a nonce
+    _nonce_lock = threading.Lock()
+    _last_nonce = 0
+    
+    def __init__(self, key: str = '', secret: str = '', tier: int = 2):
+        super().__init__(key=key, secret=secret)
+        # Swap krakenex's per-client session for the pooled keep-alive one
+        _SESSION.headers['User-Agent'] = self.session.headers['User-Agent']
+        self.session.close()
+        self.session = _SESSION
+        
+        self._raw_secret = b''
+        self._raw_secret_src = None
+        
+        # Client-side token bucket mirroring Kraken's private API counter
+        self._bucket_max, self._refill_per_sec = _TIER_LIMITS[tier]
+        self._bucket_tokens = float(self._bucket_max)
+        self._bucket_ts = time.monotonic()
+        self._bucket_lock = threading.Lock()
+        
+        # Requests fail fast until these monotonic times after repeated rate
+        # limiting; public and private calls count against different limits
+        self._public_open_until = 0.0
+        self._private_open_until = 0.0
+    
+    @_with_retry('_public_open_until')
+    def query_public(self, method: str, data: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
+        """Public query with rate-limit retries"""
+        return super().query_public(method, data, timeout=timeout)
+    
+    @_with_retry('_private_open_until')
+    def query_private(self, method: str, data: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
+        """Private query that waits for rate-limit budget before sending"""
+        self._acquire(_ENDPOINT_COSTS.get(method, 1))
+        return super().query_private(method, data, timeout=timeout)
+    
+    def close(self):
+        """Leave the pooled session open; every other client is still using it"""
+    
+    def _nonce(self) -> int:
+        """Strictly increasing microsecond nonce, safe across threads"""
+        with KrakenClient._nonce_lock:
+            KrakenClient._last_nonce = max(int(time.time() * 1e6), KrakenClient._last_nonce + 1)
+            return KrakenClient._last_nonce
+    
+    def _acquire(self, cost: int):
+        """Take cost tokens from the bucket, sleeping until they have refilled"""
+        if cost <= 0:
+            return
+        
+        with self._bucket_lock:
+            now = time.monotonic()
+            elapsed = now - self._bucket_ts
+            self._bucket_tokens = min(self._bucket_max, self._bucket_tokens + elapsed * self._refill_per_sec)
+            self._bucket_ts = now
+            # Reserve the tokens now so concurrent callers queue behind us
+            self._bucket_tokens -= cost
+            wait = -self._bucket_tokens / self._refill_per_sec if self._bucket_tokens < 0 else 0.0
+        
+        if wait:
+            time.sleep(wait)
+    
+    @_with_retry('_private_open_until')
+    def query_private_json(self, method: str, data: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
+        """Private query sent as a JSON body
+        
+        For endpoints whose parameters are arrays (AddOrderBatch,
+        CancelOrderBatch), which Kraken documents as JSON rather than
+        form fields. The signature covers the JSON body exactly as sent.
+        """
+        data = {} if data is None else dict(data)
+        if not self.key or not self.secret:
+            raise Exception('Either key or secret is not set!')
+        
+        self._acquire(_ENDPOINT_COSTS.get(method, 1))
+        data['nonce'] = self._nonce()
+        urlpath = '/' + self.apiversion + '/private/' + method
+        body = json.dumps(data, separators=(',', ':')).encode()
+        headers = {
+            'API-Key': self.key,
+            'API-Sign': self._sign_body(data['nonce'], body, urlpath),
+            'Content-Type': 'application/json'
+        }
+        return self._query(urlpath, body, headers, timeout)
+    
+    def _query(self, urlpath: str, data: Union[Dict[str, Any], bytes], headers: Dict[str, str] = None,
+               timeout: float = None) -> Dict[str, Any]:
+        """Send the request and decode the body straight from bytes"""
+        data = {} if data is None else data
+        headers = {} if headers is None else headers
+        url = self.uri + urlpath
+        
+        # Public endpoints only support GET. The response stays local rather
+        # than on self.response: one client serves several threads at once
+        if '/public/' in urlpath:
+            response = self.session.get(url, params=data, headers=headers, timeout=timeout)
+        else:
+            response = self.session.post(url, data=data, headers=headers, timeout=timeout)
+        
+        if response.status_code not in (200, 201, 202):
+            response.raise_for_status()
+        
+        return json_loads(response.content)
+    
+    def _sign(self, data: Dict[str, Any], urlpath: str) -> str:
+        """Sign form-encoded request data according to Kraken's scheme"""
+        return self._sign_body(data['nonce'], urllib.parse.urlencode(data).encode(), urlpath)
+    
+    def _sign_body(self, nonce: int, body: bytes, urlpath: str) -> str:
+        """Sign a request body, exactly as it will be sent, according to Kraken's scheme"""
+        # Re-decode only when the secret has been swapped
+        if self.secret != self._raw_secret_src:
+            self._raw_secret = base64.b64decode(self.secret)
+            self._raw_secret_src = self.secret
+        
+        message = urlpath.encode() + hashlib.sha256(str(nonce).encode() + body).digest()
+        signature = hmac.new(self._raw_secret, message, hashlib.sha512).digest()
+        return base64.b64encode(signature).decode()
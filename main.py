@@ -1,18 +1,33 @@
 import streamlit as st
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import time
 import asyncio
+import copy
+import io
 import json
 import os
+import logging
+import queue
+import string
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
 # Import custom modules
 from kraken_api import KrakenAPI
-from trading_logic import TradingStrategy
+from trading_logic import TradingStrategy, RingBuffer, wilder_step, wilder_rsi_series, rsi_from_averages, close_pnl
 
 # Page configuration
 st.set_page_config(
@@ -63,118 +78,287 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def _start_log_listener():
+    """Send kraken_api log records through a queue drained by a background thread"""
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    listener.start()
+    
+    api_logger = logging.getLogger('kraken_api')
+    api_logger.addHandler(QueueHandler(log_queue))
+    api_logger.propagate = False
+    return listener
+
+_start_log_listener()
+
+@st.cache_resource(show_spinner=False)
+def _load_cfg(path, mtime):
+    """Parse the YAML config; keyed on mtime so reruns skip the file until it changes"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+# Typical starting prices for the simulated feed
+_BASE_PRICES: Mapping[str, float] = MappingProxyType({
+    'BTC/USD': 50000,
+    'ETH/USD': 3000,
+    'SOL/USD': 150,
+    'ADA/USD': 0.50,
+    'DOT/USD': 7,
+    'XRP/USD': 0.60
+})
+
+@st.cache_resource
+def _rng():
+    """Shared PCG64 generator for the simulated price feed"""
+    return np.random.default_rng()
+
+# Per-tick volatility of the simulated random walk (0.2%)
+_SIM_VOLATILITY = 0.002
+# Simulated ticks drawn per RNG call in get_current_price
+_SIM_TICK_BATCH = 32
+
+# Trade record fields, in the order they appear in the history table
+_TRADE_COLUMNS = ['timestamp', 'type', 'entry_price', 'size', 'mode', 'status',
+                  'exit_price', 'exit_time', 'profit', 'profit_pct']
+
+@st.cache_resource(show_spinner=False)
+def _get_kraken(api_key, api_secret, sandbox):
+    """Kraken client shared across reruns; a new one is built when the credentials change"""
+    return KrakenAPI(api_key=api_key, api_secret=api_secret, sandbox=sandbox)
+
+# HTML cards for the header and metrics row
+@st.cache_resource(show_spinner=False)
+def _status_card_tmpl():
+    """Header status card template, parsed once per process"""
+    return string.Template("""
+<div style="background-color: #1E293B; padding: 10px; border-radius: 5px; text-align: center;">
+    <div style="color: #94A3B8; font-size: 12px;">${label}</div>
+    <div style="color: ${color}; font-size: 18px; font-weight: bold;">${value}</div>
+</div>
+""")
+
+@st.cache_resource(show_spinner=False)
+def _metric_card_tmpl():
+    """Metric card template, parsed once per process"""
+    return string.Template("""
+<div class="metric-card">
+    <div style="font-size: 14px; opacity: 0.9;">${label}</div>
+    <div style="font-size: 28px; font-weight: bold; color: ${color}">${value}</div>
+    <div style="font-size: 12px; margin-top: 5px;">${sub}</div>
+</div>
+""")
+
+# Number of prices/RSI values kept for the live charts
+_HISTORY_LEN = 200
+
+@st.cache_resource(show_spinner=False)
+def _session_defaults():
+    """Initial session state, built once per process; mutable values are copied on use"""
+    return MappingProxyType({
+        'trading_active': False,
+        'trading_mode': 'simulation',  # 'simulation' or 'live'
+        'balance': 10000.0,
+        'real_balance': 0.0,
+        'current_position': None,  # None, 'long', or 'short'
+        'entry_price': 0.0,
+        'position_size': 0.0,
+        'trades': [],
+        'open_trade_idx': None,  # index in trades of the OPEN record, if any
+        'prices': RingBuffer(_HISTORY_LEN),
+        'rsi_values': RingBuffer(_HISTORY_LEN, np.float32),
+        'last_update': None,
+        'api_key': '',
+        'api_secret': '',
+        'sandbox_mode': True,
+        'performance': {
+            'total_trades': 0,
+            'winning_trades': 0,
+            'total_profit': 0.0,
+            'max_drawdown': 0.0,
+            'peak_balance': 10000.0
+        },
+        'config': {
+            'rsi_length': 14,
+            'overbought': 70,
+            'oversold': 30,
+            'stop_loss': 2.0,
+            'take_profit': 4.0,
+            'position_size_pct': 10,
+            'trading_pair': 'BTC/USD',
+            'timeframe': '1m'
+        },
+        'last_trading_pair': 'BTC/USD',
+        'last_rsi_length': None  # period the RSI history and rsi_state were seeded with
+    })
+
+# Full-width horizontal line on the RSI axis; y0/y1 and line are filled in per chart
+_RSI_SHAPE_TEMPLATE = {
+    'type': 'line',
+    'xref': 'paper',
+    'x0': 0,
+    'x1': 1,
+    'yref': 'y2',
+    'opacity': 0.5
+}
+
+# Not cached: the price ticks on every rerun, so a cache would only add
+# hashing and pickling to every miss
+def _build_line_fig(prices, rsi_values, overbought, oversold):
+    """Price & RSI figure"""
+    fig = go.Figure()
+
+    # Price line
+    fig.add_trace(go.Scatter(
+        y=prices,
+        mode='lines',
+        name='Price',
+        line=dict(color='#3B82F6', width=2),
+        yaxis='y'
+    ))
+
+    # RSI line
+    if len(rsi_values) > 0:
+        fig.add_trace(go.Scatter(
+            y=rsi_values,
+            mode='lines',
+            name='RSI',
+            line=dict(color='#F59E0B', width=2),
+            yaxis='y2'
+        ))
+
+    fig.update_layout(
+        title="Price & RSI Chart",
+        xaxis_title="Time",
+        yaxis_title="Price ($)",
+        yaxis2=dict(
+            title="RSI",
+            overlaying="y",
+            side="right",
+            range=[0, 100]
+        ),
+        template="plotly_dark",
+        height=400,
+        showlegend=True,
+        # Overbought/oversold lines
+        shapes=[
+            {**_RSI_SHAPE_TEMPLATE, 'y0': overbought, 'y1': overbought,
+             'line': {'color': '#EF4444', 'dash': 'dash'}},
+            {**_RSI_SHAPE_TEMPLATE, 'y0': oversold, 'y1': oversold,
+             'line': {'color': '#10B981', 'dash': 'dash'}},
+        ],
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False, ttl=60)
+def _fake_candles(n=100):
+    """Synthetic OHLC data for the demo candlestick chart"""
+    rng = np.random.default_rng()
+    # Two batched draws instead of four separate distribution calls
+    z = rng.standard_normal((n, 2))
+    wicks = rng.uniform(50, 200, (n, 2))
+    
+    open_prices = (z[:, 0] * 1000 + 50000).cumsum()
+    return {
+        'dates': pd.date_range(end=datetime.now(), periods=n, freq='1min'),
+        'open': open_prices,
+        'high': open_prices + wicks[:, 0],
+        'low': open_prices - wicks[:, 1],
+        'close': open_prices + z[:, 1] * 100,
+    }
+
+@st.cache_data(show_spinner=False, ttl=60)
+def _build_candlestick_fig():
+    """Candlestick figure, cached so the synthetic data isn't rebuilt every rerun"""
+    candles = _fake_candles()
+    
+    fig = go.Figure(data=[go.Candlestick(
+        x=candles['dates'],
+        open=candles['open'],
+        high=candles['high'],
+        low=candles['low'],
+        close=candles['close'],
+        increasing_line_color='#10B981',
+        decreasing_line_color='#EF4444'
+    )])
+
+    fig.update_layout(
+        title="Candlestick Chart (BTC/USD)",
+        xaxis_title="Time",
+        yaxis_title="Price ($)",
+        template="plotly_dark",
+        height=400
+    )
+    
+    return fig
+
 class TradingBot:
     def __init__(self):
         self.initialize_session_state()
         self.load_config()
-        self.kraken_api = KrakenAPI(
-            api_key=st.session_state.get('api_key', ''),
-            api_secret=st.session_state.get('api_secret', ''),
-            sandbox=st.session_state.get('sandbox_mode', True)
+        self.kraken_api = _get_kraken(
+            st.session_state.get('api_key', ''),
+            st.session_state.get('api_secret', ''),
+            st.session_state.get('sandbox_mode', True)
         )
         self.strategy = TradingStrategy()
     
     def _get_base_price_for_pair(self, pair):
         """Get typical base price for a trading pair"""
-        base_prices = {
-            'BTC/USD': 50000,
-            'ETH/USD': 3000,
-            'SOL/USD': 150,
-            'ADA/USD': 0.50,
-            'DOT/USD': 7,
-            'XRP/USD': 0.60
-        }
-        return base_prices.get(pair, 100)
+        return _BASE_PRICES.get(pair, 100)
     
     def _generate_initial_prices(self, pair='BTC/USD'):
         """Generate initial simulated price data for charts"""
         base_price = self._get_base_price_for_pair(pair)
-        prices = [base_price]
-        for _ in range(99):
-            volatility = 0.002
-            change = prices[-1] * volatility * (np.random.random() - 0.5)
-            prices.append(prices[-1] + change)
-        return prices
+        steps = np.empty(100)
+        steps[0] = 1.0
+        steps[1:] = 1 + _SIM_VOLATILITY * (_rng().random(99) - 0.5)
+        return (base_price * np.cumprod(steps)).tolist()
         
     def initialize_session_state(self):
         """Initialize all session state variables"""
-        defaults = {
-            'trading_active': False,
-            'trading_mode': 'simulation',  # 'simulation' or 'live'
-            'balance': 10000.0,
-            'real_balance': 0.0,
-            'current_position': None,  # None, 'long', or 'short'
-            'entry_price': 0.0,
-            'position_size': 0.0,
-            'trades': [],
-            'prices': [],
-            'rsi_values': [],
-            'last_update': None,
-            'api_key': '',
-            'api_secret': '',
-            'sandbox_mode': True,
-            'performance': {
-                'total_trades': 0,
-                'winning_trades': 0,
-                'total_profit': 0.0,
-                'max_drawdown': 0.0,
-                'peak_balance': 10000.0
-            },
-            'config': {
-                'rsi_length': 14,
-                'overbought': 70,
-                'oversold': 30,
-                'stop_loss': 2.0,
-                'take_profit': 4.0,
-                'position_size_pct': 10,
-                'trading_pair': 'BTC/USD',
-                'timeframe': '1m'
-            },
-            'last_trading_pair': 'BTC/USD'
-        }
-        
-        for key, value in defaults.items():
+        for key, value in _session_defaults().items():
             if key not in st.session_state:
-                st.session_state[key] = value
+                st.session_state[key] = copy.deepcopy(value) if isinstance(value, (list, dict, RingBuffer)) else value
         
         # Generate initial price data if empty or trading pair changed
         current_pair = st.session_state.config.get('trading_pair', 'BTC/USD')
         pair_changed = st.session_state.get('last_trading_pair') != current_pair
         
         if len(st.session_state.prices) == 0 or pair_changed:
-            st.session_state.prices = self._generate_initial_prices(current_pair)
-            st.session_state.rsi_values = []
+            st.session_state.prices = RingBuffer(_HISTORY_LEN, values=self._generate_initial_prices(current_pair))
             st.session_state.last_trading_pair = current_pair
-            # Pre-calculate RSI values for initial prices
-            for i in range(len(st.session_state.prices)):
-                if i < 14:
-                    st.session_state.rsi_values.append(50)
-                else:
-                    prices = st.session_state.prices[:i+1]
-                    deltas = np.diff(prices[-15:])
-                    gains = np.where(deltas > 0, deltas, 0)
-                    losses = np.where(deltas < 0, -deltas, 0)
-                    avg_gain = np.mean(gains)
-                    avg_loss = np.mean(losses)
-                    if avg_loss == 0:
-                        rsi = 100
-                    else:
-                        rs = avg_gain / avg_loss
-                        rsi = 100 - (100 / (1 + rs))
-                    st.session_state.rsi_values.append(rsi)
+            self._warm_up_rsi()
+        elif st.session_state.last_rsi_length != st.session_state.config['rsi_length']:
+            # RSI length changed on the Configuration page: re-seed from the
+            # current prices so no averages from the old period carry over
+            self._warm_up_rsi()
+    
+    def _warm_up_rsi(self):
+        """Pre-calculate RSI values for initial prices with Wilder smoothing"""
+        period = st.session_state.config['rsi_length']
+        
+        # The compiled series kernel also hands back the final averages, so
+        # update_rsi carries on from them with the same recurrence
+        rsi, avg_gain, avg_loss = wilder_rsi_series(st.session_state.prices.view(), period)
+        rsi[:period] = 50.0  # neutral until `period` changes are available
+        
+        st.session_state.rsi_values = RingBuffer(_HISTORY_LEN, np.float32, rsi)
+        st.session_state.rsi_state = {'avg_gain': avg_gain, 'avg_loss': avg_loss}
+        st.session_state.last_rsi_length = period
                 
     def load_config(self):
         """Load configuration from YAML file"""
         config_path = Path('config.yaml')
         if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                if 'api_key' in config:
-                    st.session_state.api_key = config['api_key']
-                if 'api_secret' in config:
-                    st.session_state.api_secret = config['api_secret']
-                if 'sandbox_mode' in config:
-                    st.session_state.sandbox_mode = config['sandbox_mode']
+            config = _load_cfg(str(config_path), config_path.stat().st_mtime_ns)
+            if 'api_key' in config:
+                st.session_state.api_key = config['api_key']
+            if 'api_secret' in config:
+                st.session_state.api_secret = config['api_secret']
+            if 'sandbox_mode' in config:
+                st.session_state.sandbox_mode = config['sandbox_mode']
     
     def save_config(self):
         """Save configuration to YAML file"""
@@ -185,7 +369,7 @@ class TradingBot:
         }
         
         with open('config.yaml', 'w') as f:
-            yaml.dump(config, f)
+            yaml.dump(config, f, Dumper=_YamlDumper)
     
     def render_header(self):
         """Render the page header"""
@@ -196,78 +380,71 @@ class TradingBot:
             st.markdown("Real-time trading with Kraken API • Simulation & Live Modes")
         
         with col2:
-            mode = st.session_state.trading_mode.upper()
-            status_color = "#10B981" if st.session_state.trading_active else "#EF4444"
-            status_text = "ACTIVE" if st.session_state.trading_active else "STOPPED"
+            ss = st.session_state
+            mode = ss.trading_mode.upper()
+            trading_active = ss.trading_active
+            status_color = "#10B981" if trading_active else "#EF4444"
+            status_text = "ACTIVE" if trading_active else "STOPPED"
+            status_card = _status_card_tmpl()
             
-            st.markdown(f"""
-            <div style="background-color: #1E293B; padding: 10px; border-radius: 5px; text-align: center;">
-                <div style="color: #94A3B8; font-size: 12px;">MODE</div>
-                <div style="color: #F59E0B; font-size: 18px; font-weight: bold;">{mode}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(status_card.substitute(label="MODE", color="#F59E0B", value=mode), unsafe_allow_html=True)
         
         with col3:
-            st.markdown(f"""
-            <div style="background-color: #1E293B; padding: 10px; border-radius: 5px; text-align: center;">
-                <div style="color: #94A3B8; font-size: 12px;">STATUS</div>
-                <div style="color: {status_color}; font-size: 18px; font-weight: bold;">{status_text}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(status_card.substitute(label="STATUS", color=status_color, value=status_text), unsafe_allow_html=True)
         
         st.markdown("---")
     
     def render_metrics(self):
         """Render key metrics dashboard"""
+        ss = st.session_state
+        perf = ss.performance
+        trading_mode = ss.trading_mode
+        current_position = ss.current_position
+        metric_card = _metric_card_tmpl()
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            balance = st.session_state.real_balance if st.session_state.trading_mode == 'live' else st.session_state.balance
-            balance_text = f"${balance:,.2f}"
-            st.markdown(f"""
-            <div class="metric-card">
-                <div style="font-size: 14px; opacity: 0.9;">Account Balance</div>
-                <div style="font-size: 28px; font-weight: bold;">{balance_text}</div>
-                <div style="font-size: 12px; margin-top: 5px;">Mode: {st.session_state.trading_mode.upper()}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            balance = ss.real_balance if trading_mode == 'live' else ss.balance
+            st.markdown(metric_card.substitute(
+                label="Account Balance",
+                color="inherit",
+                value=f"${balance:,.2f}",
+                sub=f"Mode: {trading_mode.upper()}"
+            ), unsafe_allow_html=True)
         
         with col2:
-            position_type = st.session_state.current_position.upper() if st.session_state.current_position else "FLAT"
-            position_color = "#10B981" if st.session_state.current_position == 'long' else "#EF4444" if st.session_state.current_position == 'short' else "#94A3B8"
+            position_type = current_position.upper() if current_position else "FLAT"
+            position_color = "#10B981" if current_position == 'long' else "#EF4444" if current_position == 'short' else "#94A3B8"
             
-            st.markdown(f"""
-            <div class="metric-card">
-                <div style="font-size: 14px; opacity: 0.9;">Current Position</div>
-                <div style="font-size: 28px; font-weight: bold; color: {position_color}">{position_type}</div>
-                <div style="font-size: 12px; margin-top: 5px;">Entry: ${st.session_state.entry_price:,.2f}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(metric_card.substitute(
+                label="Current Position",
+                color=position_color,
+                value=position_type,
+                sub=f"Entry: ${ss.entry_price:,.2f}"
+            ), unsafe_allow_html=True)
         
         with col3:
-            win_rate = (st.session_state.performance['winning_trades'] / st.session_state.performance['total_trades'] * 100) if st.session_state.performance['total_trades'] > 0 else 0
-            win_rate_text = f"{win_rate:.1f}%"
+            total_trades = perf['total_trades']
+            win_rate = (perf['winning_trades'] / total_trades * 100) if total_trades > 0 else 0
             
-            st.markdown(f"""
-            <div class="metric-card">
-                <div style="font-size: 14px; opacity: 0.9;">Win Rate</div>
-                <div style="font-size: 28px; font-weight: bold;">{win_rate_text}</div>
-                <div style="font-size: 12px; margin-top: 5px;">Trades: {st.session_state.performance['total_trades']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(metric_card.substitute(
+                label="Win Rate",
+                color="inherit",
+                value=f"{win_rate:.1f}%",
+                sub=f"Trades: {total_trades}"
+            ), unsafe_allow_html=True)
         
         with col4:
-            total_pnl = st.session_state.balance - 10000
+            total_pnl = ss.balance - 10000
             pnl_color = "#10B981" if total_pnl >= 0 else "#EF4444"
             pnl_text = f"+${total_pnl:,.2f}" if total_pnl >= 0 else f"-${abs(total_pnl):,.2f}"
             
-            st.markdown(f"""
-            <div class="metric-card">
-                <div style="font-size: 14px; opacity: 0.9;">Total P&L</div>
-                <div style="font-size: 28px; font-weight: bold; color: {pnl_color}">{pnl_text}</div>
-                <div style="font-size: 12px; margin-top: 5px;">From $10,000</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(metric_card.substitute(
+                label="Total P&L",
+                color=pnl_color,
+                value=pnl_text,
+                sub="From $10,000"
+            ), unsafe_allow_html=True)
     
     def render_controls(self):
         """Render trading control buttons"""
@@ -310,119 +487,57 @@ class TradingBot:
     
     def create_line_chart(self):
         """Create line chart with price and RSI"""
-        fig = go.Figure()
-        
-        # Price line
-        fig.add_trace(go.Scatter(
-            x=list(range(len(st.session_state.prices))),
-            y=st.session_state.prices,
-            mode='lines',
-            name='Price',
-            line=dict(color='#3B82F6', width=2),
-            yaxis='y'
-        ))
-        
-        # RSI line
-        if len(st.session_state.rsi_values) > 0:
-            fig.add_trace(go.Scatter(
-                x=list(range(len(st.session_state.rsi_values))),
-                y=st.session_state.rsi_values,
-                mode='lines',
-                name='RSI',
-                line=dict(color='#F59E0B', width=2),
-                yaxis='y2'
-            ))
-        
-        # Overbought/oversold lines
-        fig.add_hline(
-            y=st.session_state.config['overbought'],
-            line_dash="dash",
-            line_color="#EF4444",
-            yref="y2",
-            opacity=0.5
-        )
-        
-        fig.add_hline(
-            y=st.session_state.config['oversold'],
-            line_dash="dash",
-            line_color="#10B981",
-            yref="y2",
-            opacity=0.5
-        )
-        
-        fig.update_layout(
-            title="Price & RSI Chart",
-            xaxis_title="Time",
-            yaxis_title="Price ($)",
-            yaxis2=dict(
-                title="RSI",
-                overlaying="y",
-                side="right",
-                range=[0, 100]
-            ),
-            template="plotly_dark",
-            height=400,
-            showlegend=True
+        ss = st.session_state
+        cfg = ss.config
+        fig = _build_line_fig(
+            ss.prices.view(),
+            ss.rsi_values.view(),
+            cfg['overbought'],
+            cfg['oversold']
         )
-        
         st.plotly_chart(fig, use_container_width=True)
     
     def create_candlestick_chart(self):
         """Create candlestick chart"""
-        # For demo, generate synthetic candlestick data
-        dates = pd.date_range(end=datetime.now(), periods=100, freq='1min')
-        open_prices = np.random.normal(50000, 1000, 100).cumsum()
-        high_prices = open_prices + np.random.uniform(50, 200, 100)
-        low_prices = open_prices - np.random.uniform(50, 200, 100)
-        close_prices = open_prices + np.random.normal(0, 100, 100)
-        
-        fig = go.Figure(data=[go.Candlestick(
-            x=dates,
-            open=open_prices,
-            high=high_prices,
-            low=low_prices,
-            close=close_prices,
-            increasing_line_color='#10B981',
-            decreasing_line_color='#EF4444'
-        )])
-        
-        fig.update_layout(
-            title="Candlestick Chart (BTC/USD)",
-            xaxis_title="Time",
-            yaxis_title="Price ($)",
-            template="plotly_dark",
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_build_candlestick_fig(), use_container_width=True)
     
     def render_trade_history(self):
         """Render trade history table"""
         st.markdown("### Trade History")
         
-        if not st.session_state.trades:
+        ss = st.session_state
+        trades = ss.trades
+        if not trades:
             st.info("No trades yet. Start trading to see history.")
             return
         
-        # Convert trades to DataFrame
-        trades_df = pd.DataFrame(st.session_state.trades)
+        # Rows before the first still-open trade are final; only the rest gets rebuilt
+        settled, cached_df = ss.get('trades_df_cache', (0, None))
+        if cached_df is None or settled > len(trades):
+            settled, cached_df = 0, None
         
-        # Format columns
-        trades_df['timestamp'] = pd.to_datetime(trades_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-        trades_df['profit'] = trades_df['profit'].apply(lambda x: f"${x:,.2f}" if pd.notnull(x) else "")
-        trades_df['profit_pct'] = trades_df['profit_pct'].apply(lambda x: f"{x:.2f}%" if pd.notnull(x) else "")
+        if cached_df is not None and settled == len(trades):
+            trades_df = cached_df
+        else:
+            new_df = self._trades_frame(trades[settled:])
+            still_open = np.flatnonzero(new_df['status'].to_numpy() != 'CLOSED')
+            if cached_df is None:
+                trades_df = new_df
+            else:
+                trades_df = pd.concat([cached_df.iloc[:settled], new_df], ignore_index=True)
+            ss.trades_df_cache = (settled + (still_open[0] if len(still_open) else len(new_df)), trades_df)
         
-        # Display table
+        # Display table; values stay numeric and are formatted by the column config
         st.dataframe(
             trades_df,
             column_config={
-                "timestamp": "Time",
+                "timestamp": st.column_config.DatetimeColumn("Time", format="YYYY-MM-DD HH:mm:ss"),
                 "type": "Type",
                 "entry_price": "Entry Price",
                 "exit_price": "Exit Price",
                 "size": "Size",
-                "profit": "Profit",
-                "profit_pct": "Profit %",
+                "profit": st.column_config.NumberColumn("Profit", format="$%.2f"),
+                "profit_pct": st.column_config.NumberColumn("Profit %", format="%.2f%%"),
                 "mode": "Mode",
                 "status": "Status"
             },
@@ -432,7 +547,9 @@ class TradingBot:
         
         # Export button
         if st.button("📥 Export as CSV"):
-            csv = trades_df.to_csv(index=False)
+            buf = io.BytesIO()
+            pa_csv.write_csv(pa.Table.from_pandas(trades_df, preserve_index=False), buf)
+            csv = buf.getvalue()
             st.download_button(
                 label="Download CSV",
                 data=csv,
@@ -440,6 +557,16 @@ class TradingBot:
                 mime="text/csv"
             )
     
+    @staticmethod
+    def _trades_frame(trades):
+        """Build the trade history DataFrame for a slice of trade records"""
+        trades_df = pd.DataFrame(trades, columns=_TRADE_COLUMNS)
+        
+        # Keep dtypes the same whether or not the slice has closed trades
+        trades_df['timestamp'] = pd.to_datetime(trades_df['timestamp'])
+        trades_df['exit_time'] = pd.to_datetime(trades_df['exit_time'])
+        return trades_df
+    
     def render_configuration(self):
         """Render configuration panel"""
         st.markdown("### Trading Configuration")
@@ -643,6 +770,9 @@ class TradingBot:
         
         # Get current price (simulated or real)
         current_price = self.get_current_price()
+        if current_price is None:
+            st.error("Live price unavailable; trade not placed")
+            return
         
         # Calculate position size
         account_balance = st.session_state.real_balance if st.session_state.trading_mode == 'live' else st.session_state.balance
@@ -660,6 +790,7 @@ class TradingBot:
         }
         
         st.session_state.trades.append(trade)
+        st.session_state.open_trade_idx = len(st.session_state.trades) - 1
         st.session_state.current_position = trade_type
         st.session_state.entry_price = current_price
         st.session_state.position_size = position_size
@@ -681,17 +812,18 @@ class TradingBot:
             return
         
         current_price = self.get_current_price()
+        if current_price is None:
+            st.error("Live price unavailable; position not closed")
+            return
         trade_type = st.session_state.current_position
-        profit = 0
         
         # Calculate profit
-        if trade_type == 'long':
-            profit = (current_price - st.session_state.entry_price) * st.session_state.position_size
-            # Add back to balance for simulation
-            if st.session_state.trading_mode == 'simulation':
-                st.session_state.balance += st.session_state.position_size * current_price
-        else:  # short
-            profit = (st.session_state.entry_price - current_price) * st.session_state.position_size
+        profit = close_pnl(st.session_state.entry_price, current_price,
+                           st.session_state.position_size, trade_type == 'long')
+        
+        # Add back to balance for simulation
+        if trade_type == 'long' and st.session_state.trading_mode == 'simulation':
+            st.session_state.balance += st.session_state.position_size * current_price
         
         # Update performance
         st.session_state.performance['total_trades'] += 1
@@ -700,14 +832,15 @@ class TradingBot:
             st.session_state.performance['winning_trades'] += 1
         
         # Update trade record
-        for trade in reversed(st.session_state.trades):
-            if trade['status'] == 'OPEN':
-                trade['exit_price'] = current_price
-                trade['exit_time'] = datetime.now()
-                trade['profit'] = profit
-                trade['profit_pct'] = (profit / (trade['entry_price'] * trade['size'])) * 100
-                trade['status'] = 'CLOSED'
-                break
+        open_idx = st.session_state.open_trade_idx
+        if open_idx is not None:
+            trade = st.session_state.trades[open_idx]
+            trade['exit_price'] = current_price
+            trade['exit_time'] = datetime.now()
+            trade['profit'] = profit
+            trade['profit_pct'] = (profit / (trade['entry_price'] * trade['size'])) * 100
+            trade['status'] = 'CLOSED'
+            st.session_state.open_trade_idx = None
         
         # Reset position
         st.session_state.current_position = None
@@ -722,12 +855,13 @@ class TradingBot:
             self.execute_real_close(trade_type, current_price)
     
     def get_current_price(self):
-        """Get current price (simulated or from Kraken)"""
+        """Get current price (simulated or from Kraken); None if the live price is unavailable"""
         if st.session_state.trading_mode == 'live' and st.session_state.api_key:
-            # Get real price from Kraken
-            price = self.kraken_api.get_ticker(st.session_state.config['trading_pair'])
-            if price:
-                return price
+            # Get real price from Kraken; streamed or recently fetched prices
+            # come from KrakenAPI's cache. Never fall back to the simulated
+            # walk here: live orders would then be placed off fake prices
+            price = self.kraken_api.get_ticker_from_cache(st.session_state.config['trading_pair'])
+            return price or None
         
         # Simulated price (random walk)
         if len(st.session_state.prices) > 0:
@@ -735,15 +869,15 @@ class TradingBot:
         else:
             last_price = self._get_base_price_for_pair(st.session_state.config['trading_pair'])
         
-        # Random walk with volatility
-        volatility = 0.002  # 0.2%
-        change = last_price * volatility * (np.random.random() - 0.5)
-        new_price = last_price + change
+        # Random walk with volatility, drawing ticks in batches
+        steps = st.session_state.get('sim_steps')
+        if not steps:
+            steps = (1 + _SIM_VOLATILITY * (_rng().random(_SIM_TICK_BATCH) - 0.5)).tolist()
+            st.session_state.sim_steps = steps
+        new_price = last_price * steps.pop()
         
-        # Update price history
+        # Update price history (the ring buffer overwrites the oldest price itself)
         st.session_state.prices.append(new_price)
-        if len(st.session_state.prices) > 200:
-            st.session_state.prices.pop(0)
         
         # Update RSI
         self.update_rsi()
@@ -751,75 +885,79 @@ class TradingBot:
         return new_price
     
     def update_rsi(self):
-        """Update RSI values"""
-        if len(st.session_state.prices) < st.session_state.config['rsi_length'] + 1:
-            st.session_state.rsi_values.append(50)
+        """Update RSI values incrementally from the latest price change"""
+        ss = st.session_state
+        prices = ss.prices
+        rsi_values = ss.rsi_values
+        period = ss.config['rsi_length']
+        rsi_state = ss.get('rsi_state')
+        
+        if rsi_state is None or len(prices) < period + 1:
+            rsi_values.append(50.0)
             return
         
-        prices = st.session_state.prices[-st.session_state.config['rsi_length']-1:]
-        deltas = np.diff(prices)
-        
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-        
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+        # Only the latest change is needed; the smoothed averages carry the rest
+        avg_gain, avg_loss = wilder_step(rsi_state['avg_gain'], rsi_state['avg_loss'],
+                                         prices[-1] - prices[-2], period)
+        rsi_state['avg_gain'] = avg_gain
+        rsi_state['avg_loss'] = avg_loss
         
-        st.session_state.rsi_values.append(rsi)
-        if len(st.session_state.rsi_values) > 200:
-            st.session_state.rsi_values.pop(0)
+        rsi_values.append(rsi_from_averages(avg_gain, avg_loss))
     
     def update_market_data(self):
         """Background task to update market data"""
-        if st.session_state.trading_active:
-            # Get new price
+        ss = st.session_state
+        if ss.trading_active:
+            cfg = ss.config
+            # Get new price; skip this tick rather than trade without one
             current_price = self.get_current_price()
+            if current_price is None:
+                st.warning("Live price unavailable; trading paused until Kraken responds")
+                return
             
             # Check for trading signals
-            if len(st.session_state.rsi_values) > 0:
-                current_rsi = st.session_state.rsi_values[-1]
+            rsi_values = ss.rsi_values
+            if len(rsi_values) > 0:
+                current_rsi = rsi_values[-1]
                 
                 # Buy signal (oversold)
-                if current_rsi < st.session_state.config['oversold'] and not st.session_state.current_position:
+                if current_rsi < cfg['oversold'] and not ss.current_position:
                     self.place_manual_trade('long')
                 
                 # Sell signal (overbought)
-                elif current_rsi > st.session_state.config['overbought'] and not st.session_state.current_position:
+                elif current_rsi > cfg['overbought'] and not ss.current_position:
                     self.place_manual_trade('short')
                 
                 # Check stop loss/take profit
-                if st.session_state.current_position:
+                if ss.current_position:
                     self.check_position_limits(current_price)
             
             # Update last update time
-            st.session_state.last_update = datetime.now()
+            ss.last_update = datetime.now()
     
     def check_position_limits(self, current_price):
         """Check if position hit stop loss or take profit"""
-        if not st.session_state.current_position or st.session_state.entry_price == 0:
+        ss = st.session_state
+        current_position = ss.current_position
+        entry_price = ss.entry_price
+        if not current_position or entry_price == 0:
             return
         
-        entry_price = st.session_state.entry_price
+        cfg = ss.config
         profit_pct = 0
         
-        if st.session_state.current_position == 'long':
+        if current_position == 'long':
             profit_pct = ((current_price - entry_price) / entry_price) * 100
         else:  # short
             profit_pct = ((entry_price - current_price) / entry_price) * 100
         
         # Check stop loss
-        if profit_pct <= -st.session_state.config['stop_loss']:
+        if profit_pct <= -cfg['stop_loss']:
             st.warning(f"Stop loss triggered: {profit_pct:.2f}%")
             self.close_position()
         
         # Check take profit
-        elif profit_pct >= st.session_state.config['take_profit']:
+        elif profit_pct >= cfg['take_profit']:
             st.success(f"Take profit triggered: {profit_pct:.2f}%")
             self.close_position()
     
@@ -889,7 +1027,8 @@ class TradingBot:
             
             st.markdown("---")
             st.markdown("### Quick Stats")
-            st.metric("Current Price", f"${self.get_current_price():,.2f}")
+            current_price = self.get_current_price()
+            st.metric("Current Price", f"${current_price:,.2f}" if current_price is not None else "Unavailable")
             if len(st.session_state.rsi_values) > 0:
                 rsi = st.session_state.rsi_values[-1]
                 rsi_color = "green" if rsi < 30 else "red" if rsi > 70 else "gray"
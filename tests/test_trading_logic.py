@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from trading_logic import Side, TradingStrategy, Trades
+
+
+def _trades(side):
+    """Open trades with the given sides, stored as int8 like simulate_strategy does"""
+    n = len(side)
+    return Trades(
+        side=np.asarray(side, dtype=np.int8),
+        entry_idx=np.zeros(n, dtype=np.int64),
+        exit_idx=np.full(n, -1, dtype=np.int64),
+        entry_px=np.full(n, 100.0),
+        exit_px=np.full(n, np.nan),
+        size=np.ones(n),
+        profit=np.full(n, np.nan),
+        profit_pct=np.full(n, np.nan),
+    )
+
+
+class PositionSideTest(unittest.TestCase):
+    def setUp(self):
+        self.strategy = TradingStrategy()
+        self.trades = _trades([Side.LONG, Side.SHORT])
+    
+    def test_stop_loss_accepts_trades_side(self):
+        long_side, short_side = self.trades.side
+        self.assertIsInstance(long_side, np.integer)
+        self.assertTrue(self.strategy.check_stop_loss(100.0, 97.0, 2.0, long_side))
+        self.assertFalse(self.strategy.check_stop_loss(100.0, 97.0, 2.0, short_side))
+        self.assertTrue(self.strategy.check_stop_loss(100.0, 103.0, 2.0, short_side))
+    
+    def test_take_profit_accepts_trades_side(self):
+        long_side, short_side = self.trades.side
+        self.assertTrue(self.strategy.check_take_profit(100.0, 105.0, 4.0, long_side))
+        self.assertFalse(self.strategy.check_take_profit(100.0, 105.0, 4.0, short_side))
+        self.assertTrue(self.strategy.check_take_profit(100.0, 95.0, 4.0, short_side))
+    
+    def test_side_matches_position_label(self):
+        for side, label in zip(self.trades.side, ('long', 'short')):
+            self.assertEqual(
+                self.strategy.check_stop_loss(100.0, 97.0, 2.0, side),
+                self.strategy.check_stop_loss(100.0, 97.0, 2.0, label),
+            )
+            self.assertEqual(
+                self.strategy.check_take_profit(100.0, 105.0, 4.0, side),
+                self.strategy.check_take_profit(100.0, 105.0, 4.0, label),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
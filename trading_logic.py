@@ -1,40 +1,506 @@
 import numpy as np
-import pandas as pd
-from typing import List, Tuple, Optional
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
+from typing import List, Tuple, Optional, Union
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+class Side(IntEnum):
+    """Position side; the value doubles as the sign of the position's PnL"""
+    FLAT = 0
+    LONG = 1
+    SHORT = -1
+
+@njit(inline='always')
+def _wilder_update(avg_gain, avg_loss, delta, inv_period, decay):
+    """One Wilder smoothing step; inv_period is 1 / period and decay is (period - 1) * inv_period
+    
+    The only copy of the recurrence: the live update, the warm-up and the
+    backtest kernels all go through it, so they agree bit for bit.
+    """
+    gain = delta if delta > 0 else 0.0
+    loss = -delta if delta < 0 else 0.0
+    return avg_gain * decay + gain * inv_period, avg_loss * decay + loss * inv_period
+
+# Explicit signatures compile the kernels eagerly at import, and cache=True
+# loads that machine code from __pycache__ on later imports, so neither the
+# first tick nor the first backtest waits on the JIT
+@njit('UniTuple(float64, 2)(float64, float64, float64, int64)', cache=True)
+def wilder_step(avg_gain: float, avg_loss: float, delta: float, period: int) -> Tuple[float, float]:
+    """Advance Wilder's smoothed average gain/loss by one price change"""
+    inv_period = 1.0 / period
+    return _wilder_update(avg_gain, avg_loss, delta, inv_period, (period - 1) * inv_period)
+
+@njit('float64(float64, float64)', cache=True)
+def rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    """RSI for given average gain and average loss"""
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+@njit('float64(float64, float64, float64, boolean)', cache=True)
+def close_pnl(entry_price: float, exit_price: float, size: float, is_long: bool) -> float:
+    """Profit of closing a position of the given size and side"""
+    if is_long:
+        return (exit_price - entry_price) * size
+    return (entry_price - exit_price) * size
+
+@njit(inline='always')
+def _wilder_rsi_series(prices, period, inv_period, decay):
+    """Wilder RSI for every bar (NaN until `period` changes are available) plus the final averages
+    
+    inv_period is 1 / period and decay is (period - 1) * inv_period, so the
+    smoothing multiplies instead of divides. Every RSI series kernel shares
+    this body, so they all agree bit for bit.
+    """
+    n = len(prices)
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out, 0.0, 0.0
+    
+    # Seed with the simple mean of the first `period` changes
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for j in range(1, period + 1):
+        delta = prices[j] - prices[j - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain *= inv_period
+    avg_loss *= inv_period
+    out[period] = rsi_from_averages(avg_gain, avg_loss)
+    
+    for i in range(period + 1, n):
+        avg_gain, avg_loss = _wilder_update(avg_gain, avg_loss, prices[i] - prices[i - 1], inv_period, decay)
+        out[i] = rsi_from_averages(avg_gain, avg_loss)
+    return out, avg_gain, avg_loss
+
+@njit(['float64[:](float64[:], int64)', 'float64[:](float32[:], int64)'], cache=True)
+def _rsi_series_nb(prices, period):
+    """Wilder RSI series for any period, compiled once for all of them"""
+    inv_period = 1.0 / period
+    return _wilder_rsi_series(prices, period, inv_period, (period - 1) * inv_period)[0]
+
+@njit('Tuple((float64[:], float64, float64))(float64[:], int64)', cache=True)
+def wilder_rsi_series(prices, period: int):
+    """Wilder RSI for every bar plus the final average gain/loss, ready to continue with wilder_step"""
+    inv_period = 1.0 / period
+    return _wilder_rsi_series(prices, period, inv_period, (period - 1) * inv_period)
+
+# Backtests usually keep one RSI period fixed, so they get a kernel with the
+# period baked in as a closure constant: numba can then constant-fold the
+# smoothing factors and give the seed loop a fixed trip count. Kernels are
+# kept per period.
+_rsi_series_kernels = {}
+
+def _rsi_series_for_period(period: int, signatures=None):
+    """Wilder RSI kernel specialized for one period; compiled on first call unless signatures are given"""
+    kernel = _rsi_series_kernels.get(period)
+    if kernel is not None:
+        return kernel
+    inv_period = 1.0 / period
+    decay = (period - 1) * inv_period
+    
+    def kernel(prices):
+        return _wilder_rsi_series(prices, period, inv_period, decay)[0]
+    
+    kernel = njit(signatures, cache=True)(kernel)
+    _rsi_series_kernels[period] = kernel
+    return kernel
+
+# The default period is compiled at import, like the other kernels
+_rsi_series_for_period(14, ['float64[:](float64[:])', 'float64[:](float32[:])'])
+
+# Kernel signature over the price dtype; balances and PnL are always float64
+_SIMULATE_SIG = ('Tuple((float64, int64, int64, int64, float64, int8[:], int64[:], int64[:], float64[:], float64[:], float64[:], float64[:], float64[:]))'
+                 '({}[:], boolean[:], boolean[:], int64[:], int64, float64, float64, float64, float64)')
+
+@njit([_SIMULATE_SIG.format('float64'), _SIMULATE_SIG.format('float32')], cache=True)
+def _simulate_nb(prices, oversold_mask, overbought_mask, next_entry, start,
+                 stop_loss, take_profit, size_pct, init_balance):
+    """Run the RSI strategy over a price array, returning trades as parallel arrays
+    
+    The masks mark bars whose RSI is below oversold / above overbought, and
+    next_entry[i] is the first bar >= i where either holds, so flat stretches
+    are skipped rather than walked. Trading starts at bar `start`.
+    side holds Side values (+1 long, -1 short); trades still open at the end
+    have exit_idx == -1 and NaN exit fields. Closed-trade count, wins and
+    total profit are tallied as trades close, so callers need no second pass.
+    """
+    n = len(prices)
+    max_trades = n // 2 + 1
+    side = np.zeros(max_trades, dtype=np.int8)
+    entry_idx = np.zeros(max_trades, dtype=np.int64)
+    exit_idx = np.full(max_trades, -1, dtype=np.int64)
+    entry_px = np.zeros(max_trades)
+    exit_px = np.full(max_trades, np.nan)
+    size = np.zeros(max_trades)
+    profit = np.full(max_trades, np.nan)
+    profit_pct = np.full(max_trades, np.nan)
+    
+    balance = init_balance
+    n_trades = 0
+    n_closed = 0
+    n_wins = 0
+    total_profit = 0.0
+    position = Side.FLAT
+    entry_price = 0.0
+    inv_entry = 0.0  # 1 / entry_price, so the per-bar PnL check multiplies instead of divides
+    position_size = 0.0
+    
+    i = start
+    while i < n:
+        if position == Side.FLAT:
+            # Jump straight to the next entry signal
+            i = next_entry[i]
+            if i >= n:
+                break
+            # Widen float32 prices so balances and PnL stay float64 even
+            # when numba is absent and NumPy promotion rules apply
+            current_price = float(prices[i])
+            position = Side.LONG if oversold_mask[i] else Side.SHORT
+            entry_price = current_price
+            inv_entry = 1.0 / entry_price
+            position_value = balance * (size_pct / 100)
+            position_size = position_value * inv_entry
+            if position == Side.LONG:
+                balance -= position_value
+            
+            side[n_trades] = position.value
+            entry_idx[n_trades] = i
+            entry_px[n_trades] = entry_price
+            size[n_trades] = position_size
+            n_trades += 1
+        
+        else:
+            # The side doubles as the sign of the PnL, so long and short share one exit check
+            current_price = float(prices[i])
+            move = position.value * (current_price - entry_price)
+            pct = move * inv_entry * 100
+            rsi_exit = overbought_mask[i] if position == Side.LONG else oversold_mask[i]
+            if pct <= -stop_loss or pct >= take_profit or rsi_exit:
+                if position == Side.LONG:
+                    balance += position_size * current_price
+                k = n_trades - 1
+                trade_profit = move * position_size
+                exit_idx[k] = i
+                exit_px[k] = current_price
+                profit[k] = trade_profit
+                profit_pct[k] = pct
+                n_closed += 1
+                n_wins += trade_profit > 0
+                total_profit += trade_profit
+                position = Side.FLAT
+        i += 1
+    
+    # Close any open long position at the end
+    if position == Side.LONG:
+        last = float(prices[n - 1])
+        balance += position_size * last
+        k = n_trades - 1
+        trade_profit = (last - entry_price) * position_size
+        exit_idx[k] = n - 1
+        exit_px[k] = last
+        profit[k] = trade_profit
+        profit_pct[k] = (last - entry_price) * inv_entry * 100
+        n_closed += 1
+        n_wins += trade_profit > 0
+        total_profit += trade_profit
+    
+    return (balance, n_trades, n_closed, n_wins, total_profit,
+            side[:n_trades], entry_idx[:n_trades], exit_idx[:n_trades],
+            entry_px[:n_trades], exit_px[:n_trades], size[:n_trades],
+            profit[:n_trades], profit_pct[:n_trades])
+
+# No eager signature here: compiling a parallel kernel starts numba's thread
+# pool, and doing that at import (e.g. on Streamlit's script thread) can keep
+# the process from exiting, so this one compiles on first use
+@njit(parallel=True, cache=True)
+def _simulate_grid_nb(prices, rsi_grid, rsi_row, periods, oversolds, overboughts, stops, tps,
+                      size_pct, init_balance):
+    """Run _simulate_nb for every parameter set in parallel; trades come back as (K, max_trades) arrays
+    
+    rsi_grid holds one RSI series per distinct period and rsi_row[k] picks
+    the series for parameter set k.
+    """
+    n = len(prices)
+    n_cfg = len(periods)
+    max_trades = n // 2 + 1
+    balances = np.empty(n_cfg)
+    n_trades = np.zeros(n_cfg, dtype=np.int64)
+    total_trades = np.zeros(n_cfg, dtype=np.int64)
+    winning_trades = np.zeros(n_cfg, dtype=np.int64)
+    total_profit = np.zeros(n_cfg)
+    side = np.zeros((n_cfg, max_trades), dtype=np.int8)
+    entry_idx = np.zeros((n_cfg, max_trades), dtype=np.int64)
+    exit_idx = np.full((n_cfg, max_trades), -1, dtype=np.int64)
+    entry_px = np.zeros((n_cfg, max_trades))
+    exit_px = np.full((n_cfg, max_trades), np.nan)
+    size = np.zeros((n_cfg, max_trades))
+    profit = np.full((n_cfg, max_trades), np.nan)
+    profit_pct = np.full((n_cfg, max_trades), np.nan)
+    
+    for k in prange(n_cfg):
+        rsi = rsi_grid[rsi_row[k]]
+        oversold_mask = rsi < oversolds[k]
+        overbought_mask = rsi > overboughts[k]
+        next_entry = np.empty(n, dtype=np.int64)
+        nxt = n
+        for i in range(n - 1, -1, -1):
+            if oversold_mask[i] or overbought_mask[i]:
+                nxt = i
+            next_entry[i] = nxt
+        
+        result = _simulate_nb(prices, oversold_mask, overbought_mask, next_entry, periods[k] + 1,
+                              stops[k], tps[k], size_pct, init_balance)
+        balances[k] = result[0]
+        count = result[1]
+        n_trades[k] = count
+        total_trades[k] = result[2]
+        winning_trades[k] = result[3]
+        total_profit[k] = result[4]
+        side[k, :count] = result[5]
+        entry_idx[k, :count] = result[6]
+        exit_idx[k, :count] = result[7]
+        entry_px[k, :count] = result[8]
+        exit_px[k, :count] = result[9]
+        size[k, :count] = result[10]
+        profit[k, :count] = result[11]
+        profit_pct[k, :count] = result[12]
+    
+    return (balances, n_trades, total_trades, winning_trades, total_profit,
+            side, entry_idx, exit_idx, entry_px, exit_px, size, profit, profit_pct)
+
+# Side for each position label (and back); flat/unknown positions map to Side.FLAT
+_POSITION_SIGNS = {'long': Side.LONG, 'short': Side.SHORT}
+_SIDE_LABELS = {Side.LONG: 'long', Side.SHORT: 'short'}
+
+def _position_sign(position_type: Union[str, int]) -> Side:
+    """Side.LONG (+1), Side.SHORT (-1) or Side.FLAT (0); Python and NumPy integer signs map to their Side"""
+    if isinstance(position_type, (int, np.integer)):
+        return Side(int(position_type))
+    return _POSITION_SIGNS.get(position_type, Side.FLAT)
+
+@lru_cache(maxsize=32)
+def _rsi_of_window(window: Tuple[float, ...]) -> float:
+    """Simple-average RSI over a price window; memoized for repeated ticks"""
+    deltas = np.diff(np.asarray(window, dtype=np.float64))
+    
+    gains = np.maximum(deltas, 0.0)
+    losses = gains - deltas  # == max(-delta, 0)
+    
+    avg_gain = gains.mean()
+    avg_loss = losses.mean()
+    
+    if avg_loss == 0:
+        return 100.0
+    
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+    
+    return float(rsi)
+
+class RingBuffer:
+    """Fixed-capacity NumPy array that overwrites its oldest value once full
+    
+    Appends and [-1]-style reads are O(1) with no list/array conversion;
+    view() returns the values oldest-first and only copies once wrapped.
+    """
+    
+    def __init__(self, capacity: int, dtype=np.float64, values=()):
+        self._buf = np.empty(capacity, dtype=dtype)
+        self._head = 0  # total values ever appended; head % capacity is the next slot
+        self.extend(values)
+    
+    def __len__(self) -> int:
+        return min(self._head, len(self._buf))
+    
+    def __getitem__(self, index: int) -> float:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('RingBuffer index out of range')
+        return self._buf[(self._head - n + index) % len(self._buf)].item()
+    
+    def append(self, value: float):
+        self._buf[self._head % len(self._buf)] = value
+        self._head += 1
+    
+    def extend(self, values):
+        capacity = len(self._buf)
+        values = np.asarray(values, dtype=self._buf.dtype)[-capacity:]
+        self._buf[(self._head + np.arange(len(values))) % capacity] = values
+        self._head += len(values)
+    
+    def view(self) -> np.ndarray:
+        """Values in insertion order, oldest first"""
+        capacity = len(self._buf)
+        if self._head <= capacity:
+            return self._buf[:self._head]
+        start = self._head % capacity
+        return np.concatenate((self._buf[start:], self._buf[:start]))
+
+@dataclass(eq=False)
+class Trades:
+    """Simulated trades stored as parallel arrays (struct-of-arrays)
+    
+    Behaves like the old list of trade dicts when indexed or iterated; the
+    dicts are only built the first time that happens.
+    """
+    side: np.ndarray
+    entry_idx: np.ndarray
+    exit_idx: np.ndarray
+    entry_px: np.ndarray
+    exit_px: np.ndarray
+    size: np.ndarray
+    profit: np.ndarray
+    profit_pct: np.ndarray
+    _dicts: Optional[List[dict]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __len__(self) -> int:
+        return len(self.side)
+    
+    def __iter__(self):
+        return iter(self.to_dicts())
+    
+    def __getitem__(self, index):
+        return self.to_dicts()[index]
+    
+    def __eq__(self, other):
+        # Compare as the trade dicts; the generated dataclass __eq__ would
+        # compare ndarrays, whose truth value is ambiguous
+        if isinstance(other, Trades):
+            other = other.to_dicts()
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+    
+    def to_dicts(self) -> List[dict]:
+        """Trades as a list of dicts; open trades have no exit/profit keys"""
+        if self._dicts is None:
+            dicts = []
+            for k in range(len(self.side)):
+                trade = {
+                    'type': _SIDE_LABELS[self.side[k]],
+                    'entry_price': float(self.entry_px[k]),
+                    'entry_time': int(self.entry_idx[k]),
+                    'size': float(self.size[k])
+                }
+                if self.exit_idx[k] >= 0:
+                    trade['exit_price'] = float(self.exit_px[k])
+                    trade['exit_time'] = int(self.exit_idx[k])
+                    trade['profit'] = float(self.profit[k])
+                    trade['profit_pct'] = float(self.profit_pct[k])
+                dicts.append(trade)
+            self._dicts = dicts
+        return self._dicts
+
+def to_dataframe(trades: Trades):
+    """Trades as a pandas DataFrame, one column per field (open trades have exit_time -1)
+    
+    pandas is only imported when this is called.
+    """
+    import pandas as pd
+    
+    return pd.DataFrame({
+        'type': np.where(trades.side == Side.LONG, 'long', 'short'),
+        'entry_price': trades.entry_px,
+        'entry_time': trades.entry_idx,
+        'size': trades.size,
+        'exit_price': trades.exit_px,
+        'exit_time': trades.exit_idx,
+        'profit': trades.profit,
+        'profit_pct': trades.profit_pct
+    })
 
 class TradingStrategy:
+    """RSI strategy helpers
+    
+    Signals, update_rsi and simulate_strategy all use Wilder's RSI;
+    calculate_rsi is the simple-average RSI of the trailing window only.
+    """
+    
     def __init__(self):
-        self.prices = []
-        self.rsi_values = []
+        self._last_price = None  # previous price fed to update_rsi
+        self._n_changes = 0  # price changes seen by update_rsi
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
     
-    def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate RSI for given prices"""
-        if len(prices) < period + 1:
+    def calculate_rsi(self, prices: List[float], period: int = 14, end_idx: Optional[int] = None) -> float:
+        """Calculate RSI for given prices, as of end_idx (default: the last price)"""
+        if end_idx is None:
+            end_idx = len(prices) - 1
+        elif end_idx >= len(prices):
+            raise IndexError(f"end_idx {end_idx} out of range for {len(prices)} prices")
+        if end_idx < period:
             return 50.0
         
-        deltas = np.diff(prices[-period-1:])
-        
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
+        # Only the trailing window is touched; on an ndarray this is a view, not a copy
+        window = prices[end_idx - period:end_idx + 1]
+        tail = tuple(window.tolist() if isinstance(window, np.ndarray) else window)
+        return _rsi_of_window(tail)
+    
+    def calculate_rsi_series(self, prices, period: int = 14, dtype=np.float64) -> np.ndarray:
+        """Wilder RSI for every bar of a price series (NaN for the first `period` bars)"""
+        return _rsi_series_for_period(int(period))(np.asarray(prices, dtype=dtype))
+    
+    def calculate_rsi_grid(self, prices, periods, dtype=np.float64) -> np.ndarray:
+        """RSI series for several periods at once, shaped (len(periods), len(prices))"""
+        prices = np.asarray(prices, dtype=dtype)
+        periods = np.asarray(periods, dtype=np.int64)
+        grid = np.empty((len(periods), len(prices)))
+        for k in range(len(periods)):
+            grid[k] = _rsi_series_nb(prices, periods[k])
+        return grid
+    
+    def update_rsi(self, last_price: float, period: int = 14) -> float:
+        """Add the latest price and return the Wilder RSI, updated in O(1)
         
-        if avg_loss == 0:
-            return 100.0
+        Only the previous price and the two averages are kept, so memory
+        stays constant however long the stream runs.
+        """
+        prev_price = self._last_price
+        self._last_price = last_price = float(last_price)
+        if prev_price is None:
+            return 50.0
         
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        delta = last_price - prev_price
+        self._n_changes += 1
+        if self._n_changes > period:
+            self._avg_gain, self._avg_loss = wilder_step(self._avg_gain, self._avg_loss, delta, period)
+            return rsi_from_averages(self._avg_gain, self._avg_loss)
         
-        return rsi
+        # Sum the first `period` changes, then scale them into the seed averages
+        if delta > 0:
+            self._avg_gain += delta
+        else:
+            self._avg_loss -= delta
+        if self._n_changes < period:
+            return 50.0
+        inv_period = 1.0 / period
+        self._avg_gain *= inv_period
+        self._avg_loss *= inv_period
+        return rsi_from_averages(self._avg_gain, self._avg_loss)
     
     def get_signal(self, prices: List[float], rsi_period: int = 14, 
                    oversold: int = 30, overbought: int = 70) -> str:
-        """Get trading signal based on RSI"""
+        """Get trading signal based on Wilder's RSI, as in simulate_strategy"""
         if len(prices) < rsi_period + 1:
             return "hold"
         
-        rsi = self.calculate_rsi(prices, rsi_period)
+        rsi = self.calculate_rsi_series(prices, rsi_period)[-1]
         
         if rsi < oversold:
             return "buy"
@@ -56,121 +522,46 @@ class TradingStrategy:
         return position_size
     
     def check_stop_loss(self, entry_price: float, current_price: float, 
-                       stop_loss_pct: float, position_type: str) -> bool:
-        """Check if stop loss has been hit"""
-        if position_type == 'long':
-            loss_pct = ((current_price - entry_price) / entry_price) * 100
-            return loss_pct <= -stop_loss_pct
-        elif position_type == 'short':
-            loss_pct = ((entry_price - current_price) / entry_price) * 100
-            return loss_pct <= -stop_loss_pct
-        return False
+                       stop_loss_pct: float, position_type: Union[str, int]) -> bool:
+        """Check if stop loss has been hit ('long'/'short' or a +1/-1 sign)"""
+        sign = _position_sign(position_type)
+        return sign != 0 and sign * (current_price - entry_price) / entry_price * 100 <= -stop_loss_pct
     
     def check_take_profit(self, entry_price: float, current_price: float,
-                         take_profit_pct: float, position_type: str) -> bool:
-        """Check if take profit has been hit"""
-        if position_type == 'long':
-            profit_pct = ((current_price - entry_price) / entry_price) * 100
-            return profit_pct >= take_profit_pct
-        elif position_type == 'short':
-            profit_pct = ((entry_price - current_price) / entry_price) * 100
-            return profit_pct >= take_profit_pct
-        return False
+                         take_profit_pct: float, position_type: Union[str, int]) -> bool:
+        """Check if take profit has been hit ('long'/'short' or a +1/-1 sign)"""
+        sign = _position_sign(position_type)
+        return sign != 0 and sign * (current_price - entry_price) / entry_price * 100 >= take_profit_pct
     
     def simulate_strategy(self, historical_prices: List[float], initial_balance: float = 10000,
                          rsi_period: int = 14, oversold: int = 30, overbought: int = 70,
                          stop_loss: float = 2.0, take_profit: float = 4.0,
-                         position_size_pct: float = 10) -> dict:
-        """Simulate trading strategy on historical data"""
-        balance = initial_balance
-        position = None
-        entry_price = 0
-        position_size = 0
-        trades = []
-        
-        for i in range(rsi_period + 1, len(historical_prices)):
-            current_price = historical_prices[i]
-            price_window = historical_prices[:i+1]
-            
-            # Get RSI signal
-            rsi = self.calculate_rsi(price_window, rsi_period)
-            
-            if position is None:
-                # Check for entry signal
-                if rsi < oversold:
-                    # Buy signal
-                    position = 'long'
-                    entry_price = current_price
-                    position_value = balance * (position_size_pct / 100)
-                    position_size = position_value / entry_price
-                    balance -= position_value
-                    
-                    trades.append({
-                        'type': 'long',
-                        'entry_price': entry_price,
-                        'entry_time': i,
-                        'size': position_size
-                    })
-                    
-                elif rsi > overbought:
-                    # Sell signal (short)
-                    position = 'short'
-                    entry_price = current_price
-                    position_value = balance * (position_size_pct / 100)
-                    position_size = position_value / entry_price
-                    
-                    trades.append({
-                        'type': 'short',
-                        'entry_price': entry_price,
-                        'entry_time': i,
-                        'size': position_size
-                    })
-            
-            else:
-                # Check for exit signals
-                if position == 'long':
-                    profit_pct = ((current_price - entry_price) / entry_price) * 100
-                    
-                    if profit_pct <= -stop_loss or profit_pct >= take_profit or rsi > overbought:
-                        # Exit long position
-                        balance += position_size * current_price
-                        
-                        trades[-1]['exit_price'] = current_price
-                        trades[-1]['exit_time'] = i
-                        trades[-1]['profit'] = (current_price - entry_price) * position_size
-                        trades[-1]['profit_pct'] = profit_pct
-                        
-                        position = None
-                        entry_price = 0
-                        position_size = 0
-                
-                elif position == 'short':
-                    profit_pct = ((entry_price - current_price) / entry_price) * 100
-                    
-                    if profit_pct <= -stop_loss or profit_pct >= take_profit or rsi < oversold:
-                        # Exit short position
-                        trades[-1]['exit_price'] = current_price
-                        trades[-1]['exit_time'] = i
-                        trades[-1]['profit'] = (entry_price - current_price) * position_size
-                        trades[-1]['profit_pct'] = profit_pct
-                        
-                        position = None
-                        entry_price = 0
-                        position_size = 0
-        
-        # Close any open position at the end
-        if position is not None:
-            if position == 'long':
-                balance += position_size * historical_prices[-1]
-                trades[-1]['exit_price'] = historical_prices[-1]
-                trades[-1]['exit_time'] = len(historical_prices) - 1
-                trades[-1]['profit'] = (historical_prices[-1] - entry_price) * position_size
-                trades[-1]['profit_pct'] = ((historical_prices[-1] - entry_price) / entry_price) * 100
-        
-        # Calculate performance metrics
-        total_trades = len([t for t in trades if 'profit' in t])
-        winning_trades = len([t for t in trades if 'profit' in t and t['profit'] > 0])
-        total_profit = sum([t.get('profit', 0) for t in trades])
+                         position_size_pct: float = 10, dtype=np.float32) -> dict:
+        """Simulate trading strategy on historical data using Wilder's RSI
+        
+        Prices are held as float32 by default, which halves the memory the
+        kernels stream through; pass dtype=np.float64 for full precision.
+        Balances and profits are always float64.
+        """
+        prices = np.asarray(historical_prices, dtype=dtype)
+        rsi = self.calculate_rsi_series(prices, rsi_period, dtype)
+        
+        # Signals as boolean masks (NaN RSI compares False), plus the index of
+        # the next bar with any entry signal so the kernel can skip "hold" bars
+        oversold_mask = rsi < oversold
+        overbought_mask = rsi > overbought
+        n = len(prices)
+        signal_idx = np.where(oversold_mask | overbought_mask, np.arange(n), n)
+        next_entry = np.minimum.accumulate(signal_idx[::-1])[::-1]
+        
+        balance, n_trades, total_trades, winning_trades, total_profit, *columns = _simulate_nb(
+            prices, oversold_mask, overbought_mask, next_entry, rsi_period + 1,
+            stop_loss, take_profit, position_size_pct, initial_balance
+        )
+        
+        trades = Trades(*columns)
+        
+        # Performance metrics over the closed trades, tallied by the kernel
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
         return {
@@ -181,4 +572,56 @@ class TradingStrategy:
             'win_rate': win_rate,
             'total_profit': total_profit,
             'trades': trades
-        }
\ No newline at end of file
+        }
+    
+    def simulate_grid(self, historical_prices: List[float], periods, oversolds, overboughts,
+                      stop_losses, take_profits, initial_balance: float = 10000,
+                      position_size_pct: float = 10, dtype=np.float32) -> dict:
+        """Simulate many parameter sets over the same prices in one parallel pass
+        
+        The parameter arguments are broadcast against each other, so scalars
+        and equal-length arrays can be mixed; RSI is computed once per
+        distinct period. Metrics come back as arrays with one entry per
+        parameter set and 'trades' holds one Trades per set. dtype works as
+        in simulate_strategy.
+        """
+        prices = np.asarray(historical_prices, dtype=dtype)
+        periods, oversolds, overboughts, stop_losses, take_profits = (
+            np.ascontiguousarray(a).ravel() for a in np.broadcast_arrays(
+                np.asarray(periods, dtype=np.int64),
+                np.asarray(oversolds, dtype=np.float64),
+                np.asarray(overboughts, dtype=np.float64),
+                np.asarray(stop_losses, dtype=np.float64),
+                np.asarray(take_profits, dtype=np.float64)
+            )
+        )
+        unique_periods, rsi_row = np.unique(periods, return_inverse=True)
+        rsi_grid = self.calculate_rsi_grid(prices, unique_periods, dtype)
+        
+        (balances, n_trades, total_trades, winning_trades, total_profit,
+         *columns) = _simulate_grid_nb(
+            prices, rsi_grid, rsi_row.astype(np.int64).ravel(), periods,
+            oversolds, overboughts, stop_losses, take_profits,
+            float(position_size_pct), float(initial_balance)
+        )
+        
+        # Closed-trade counts and profit per set are tallied by the kernel
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = np.where(total_trades > 0, winning_trades / total_trades * 100, 0.0)
+        
+        trades = [Trades(*(col[k, :n_trades[k]] for col in columns)) for k in range(len(periods))]
+        
+        return {
+            'periods': periods,
+            'oversolds': oversolds,
+            'overboughts': overboughts,
+            'stop_losses': stop_losses,
+            'take_profits': take_profits,
+            'final_balance': balances,
+            'total_return': (balances - initial_balance) / initial_balance * 100,
+            'total_trades': total_trades,
+            'winning_trades': winning_trades,
+            'win_rate': win_rate,
+            'total_profit': total_profit,
+            'trades': trades
+        }